@@ -28,7 +28,7 @@ from ecommerce.extensions.basket.constants import (
 from ecommerce.extensions.order.exceptions import AlreadyPlacedOrderException
 from ecommerce.extensions.order.utils import UserAlreadyPlacedOrder
 from ecommerce.extensions.payment.constants import DISABLE_MICROFRONTEND_FOR_BASKET_PAGE_FLAG_NAME
-from ecommerce.extensions.payment.utils import embargo_check
+from ecommerce.extensions.payment.utils import embargo_check, get_country_by_code
 from ecommerce.programs.utils import get_program
 from ecommerce.referrals.models import Referral
 
@@ -37,7 +37,6 @@ Basket = get_model('basket', 'Basket')
 BasketAttribute = get_model('basket', 'BasketAttribute')
 BasketAttributeType = get_model('basket', 'BasketAttributeType')
 BillingAddress = get_model('order', 'BillingAddress')
-Country = get_model('address', 'Country')
 BUNDLE = 'bundle_identifier'
 ORGANIZATION_ATTRIBUTE_TYPE = 'organization'
 ENTERPRISE_CATALOG_ATTRIBUTE_TYPE = 'enterprise_catalog_uuid'
@@ -618,7 +617,7 @@ def get_billing_address_from_payment_intent_data(payment_intent):
         line4=customer_address['city'],  # Oscar uses line4 for city
         postcode='' if not customer_address['postal_code'] else customer_address['postal_code'],  # postcode is optional
         state='' if not customer_address['state'] else customer_address['state'],  # state is optional
-        country=Country.objects.get(iso_3166_1_a2__iexact=customer_address['country'])
+        country=get_country_by_code(customer_address['country'])
     )
     return address
 
@@ -297,9 +297,12 @@ class EdxOrderPlacementMixin(OrderPlacementMixin, metaclass=abc.ABCMeta):
             order (Order): Order object
 
         """
+        # Only bulk (enrollment code) purchases get an invoice, so skip the attribute lookups for everything else.
         basket_has_enrollment_code_product = any(
             line.product.is_enrollment_code_product for line in order.basket.all_lines()
         )
+        if not basket_has_enrollment_code_product:
+            return
 
         organization_attribute = BasketAttributeType.objects.filter(name=ORGANIZATION_ATTRIBUTE_TYPE).first()
         if not organization_attribute:
@@ -309,7 +312,7 @@ class EdxOrderPlacementMixin(OrderPlacementMixin, metaclass=abc.ABCMeta):
             basket=order.basket,
             attribute_type=organization_attribute,
         ).first()
-        if basket_has_enrollment_code_product and business_client:
+        if business_client:
             client, __ = BusinessClient.objects.get_or_create(name=business_client.value_text)
             Invoice.objects.create(
                 order=order, business_client=client, type=Invoice.BULK_PURCHASE, state=Invoice.PAID
@@ -12,6 +12,7 @@ import pycountry
 import requests
 from django.conf import settings
 from django.contrib.auth import logout
+from edx_django_utils.cache import TieredCache
 from oscar.core.loading import get_model
 from requests.exceptions import HTTPError, Timeout
 
@@ -41,6 +42,14 @@ def checkSDN(request, name, city, country):
             api_key=settings.SDN_CHECK_API_KEY,
             sdn_list=site_configuration.sdn_api_list
         )
+        # A clean result is cached briefly, so that retrying with the same details after a declined payment does not
+        # call the SDN API again. Hits, and results from the fallback data, are never cached.
+        cache_key = 'sdn_check_clear_{}'.format(hashlib.sha256(
+            '{}|{}|{}|{}'.format(name, city, country, site_configuration.sdn_api_list).lower().encode('utf-8')
+        ).hexdigest())
+        if TieredCache.get_cached_response(cache_key).is_found:
+            return hit_count
+
         try:
             response = sdn_check.search(name, city, country)
         except (HTTPError, Timeout) as e:
@@ -58,6 +67,9 @@ def checkSDN(request, name, city, country):
                 country
             )
             response = {'total': sdn_fallback_hit_count}
+        else:
+            if response['total'] == 0:
+                TieredCache.set_all_tiers(cache_key, True, settings.SDN_CHECK_CACHE_TIMEOUT)
         hit_count = response['total']
         if hit_count > 0:
             logger.info(
@@ -93,12 +105,13 @@ def checkSDNFallback(name, city, country):
     records = SDNFallbackData.get_current_records_and_filter_by_source_and_type(
         'Specially Designated Nationals (SDN) - Treasury Department', 'Individual'
     )
-    records = records.filter(countries__contains=country)
+    records = records.filter(countries__contains=country).values_list('names', 'addresses')
     processed_name, processed_city = process_text(name), process_text(city)
-    for record in records:
-        record_names, record_addresses = set(record.names.split()), set(record.addresses.split())
-        if (processed_name.issubset(record_names) and processed_city.issubset(record_addresses)):
-            hit_count = hit_count + 1
+    # Only the two processed text columns are needed for matching, so score the whole
+    # filtered list in a single pass over the projected rows instead of hydrating models.
+    for record_names, record_addresses in records.iterator():
+        if processed_name.issubset(record_names.split()) and processed_city.issubset(record_addresses.split()):
+            hit_count += 1
     return hit_count
 
 
@@ -101,6 +101,22 @@ class SDNCheckTests(TestCase):
         response = self.sdn_validator.search(self.name, self.city, self.country)
         self.assertEqual(response, sdn_response)
 
+    def test_check_sdn_caches_clear_result(self):
+        """ Verify a clean SDN API result is cached, so repeating the check with the same details skips the API. """
+        request = RequestFactory().post('/payment/cybersource/submit/')
+        SessionMiddleware().process_request(request)
+        request.session.save()
+        request.site = self.site
+        request.user = self.user
+
+        with mock.patch.object(SDNClient, 'search', return_value={'total': 0}) as mock_search:
+            self.assertEqual(checkSDN(request, self.name, self.city, self.country), 0)
+            self.assertEqual(checkSDN(request, self.name.upper(), self.city, self.country), 0)
+            self.assertEqual(mock_search.call_count, 1)
+
+            checkSDN(request, self.name, 'Another lair', self.country)
+            self.assertEqual(mock_search.call_count, 2)
+
     @responses.activate
     def test_sdn_check_unicode_match(self):
         """ Verify the SDN check returns the number of matches and records the match. """
@@ -4,6 +4,7 @@
 import base64
 import hashlib
 import hmac
+from functools import lru_cache
 from importlib import import_module
 
 from django.conf import settings
@@ -11,9 +12,13 @@ from django.conf import settings
 from ecommerce.extensions.payment import exceptions
 
 
+@lru_cache(maxsize=None)
 def get_processor_class(path):
     """Return the payment processor class at the specified path.
 
+    Resolved classes are cached by path, since the set of configured processors
+    is fixed for the lifetime of the process.
+
     Arguments:
         path (string): Fully-qualified path to a payment processor class.
 
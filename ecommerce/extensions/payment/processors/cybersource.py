@@ -58,13 +58,12 @@ from ecommerce.extensions.payment.processors import (
     BaseClientSidePaymentProcessor,
     HandledProcessorResponse
 )
-from ecommerce.extensions.payment.utils import clean_field_value, get_basket_program_uuid
+from ecommerce.extensions.payment.utils import clean_field_value, get_basket_program_uuid, get_country_by_code
 
 logger = logging.getLogger(__name__)
 
 
 BillingAddress = get_model('order', 'BillingAddress')
-Country = get_model('address', 'Country')
 Order = get_model('order', 'Order')
 OrderNumberGenerator = get_class('order.utils', 'OrderNumberGenerator')
 PaymentProcessorResponse = get_model('payment', 'PaymentProcessorResponse')
@@ -791,7 +790,7 @@ class CybersourceREST(ApplePayMixin, BaseClientSidePaymentProcessor):
             line4=form_data['city'],
             postcode=form_data['postal_code'],
             state=form_data['state'],
-            country=Country.objects.get(iso_3166_1_a2=form_data['country'])
+            country=get_country_by_code(form_data['country'])
         )
         decoded_payment_token = None
         for _, decoded_capture_context in self._unexpired_capture_contexts(request.session):
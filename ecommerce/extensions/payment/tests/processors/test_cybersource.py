@@ -126,7 +126,7 @@ class CybersourceTests(CybersourceMixin, PaymentProcessorTestCaseMixin, TestCase
         """ The method should authorize and settle an Apple Pay payment with CyberSource. """
         basket = create_basket(owner=self.create_user(), site=self.site)
 
-        billing_address = factories.BillingAddressFactory()
+        billing_address = factories.BillingAddressFactory.build()
         payment_token = {
             'paymentData': {
                 'version': 'EC_v1',
@@ -163,7 +163,7 @@ class CybersourceTests(CybersourceMixin, PaymentProcessorTestCaseMixin, TestCase
 
         basket = create_basket(site=self.site, owner=self.create_user())
 
-        billing_address = factories.BillingAddressFactory()
+        billing_address = factories.BillingAddressFactory.build()
         payment_token = {
             'paymentData': {
                 'version': 'EC_v1',
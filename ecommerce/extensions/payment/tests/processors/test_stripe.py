@@ -18,6 +18,11 @@ BillingAddress = get_model('order', 'BillingAddress')
 Country = get_model('address', 'Country')
 
 
+def make_refund(refund_id):
+    """ Build the Stripe Refund object returned by the mocked Refund API calls. """
+    return stripe.Refund.construct_from({'id': refund_id}, 'fake-key')
+
+
 class StripeTests(PaymentProcessorTestCaseMixin, TestCase):
     processor_class = Stripe
     processor_name = 'stripe'
@@ -107,9 +112,7 @@ class StripeTests(PaymentProcessorTestCaseMixin, TestCase):
 
     def test_issue_credit(self):
         charge_reference_number = '9436'
-        refund = stripe.Refund.construct_from({
-            'id': '946',
-        }, 'fake-key')
+        refund = make_refund('946')
         order = create_order(basket=self.basket)
 
         with mock.patch('stripe.Refund.create') as refund_mock:
@@ -150,9 +153,7 @@ class StripeTests(PaymentProcessorTestCaseMixin, TestCase):
 
             with mock.patch('stripe.Refund.list') as list_mock:
                 charge_reference_number = '9436'
-                refund = stripe.Refund.construct_from({
-                    'id': '946',
-                }, 'fake-key')
+                refund = make_refund('946')
                 list_mock.return_value = {
                     'data': [refund]
                 }
@@ -178,9 +179,7 @@ class StripeTests(PaymentProcessorTestCaseMixin, TestCase):
 
             with mock.patch('stripe.Refund.list') as list_mock:
                 charge_reference_number = '9436'
-                refund = stripe.Refund.construct_from({
-                    'id': '946',
-                }, 'fake-key')
+                refund = make_refund('946')
                 list_mock.return_value = {
                     'data': [refund]
                 }
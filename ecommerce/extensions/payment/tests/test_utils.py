@@ -3,8 +3,9 @@ import json
 from urllib.parse import urljoin
 
 import responses
+from oscar.test.factories import CountryFactory
 
-from ecommerce.extensions.payment.utils import clean_field_value, middle_truncate
+from ecommerce.extensions.payment.utils import clean_field_value, get_country_by_code, middle_truncate
 from ecommerce.tests.testcases import TestCase
 
 
@@ -28,6 +29,15 @@ class UtilsTests(TestCase):
         """ Verify the passed value is cleaned of specific special characters. """
         value = 'Some^text:\'test-value'
         self.assertEqual(clean_field_value(value), 'Sometexttest-value')
+        self.assertEqual(clean_field_value('"Quoted" value'), 'Quoted value')
+
+    def test_get_country_by_code(self):
+        """ Verify the country is looked up case-insensitively and only queried once. """
+        country = CountryFactory(iso_3166_1_a2='US')
+
+        with self.assertNumQueries(1):
+            self.assertEqual(get_country_by_code('us'), country)
+            self.assertEqual(get_country_by_code('US'), country)
 
 
 class EmbargoCheckTests(TestCase):
@@ -6,6 +6,7 @@ import json
 
 import ddt
 import mock
+import requests
 import responses
 from CyberSource.rest import ApiException, RESTResponse
 from django.contrib.auth import get_user
@@ -24,6 +25,7 @@ from ecommerce.extensions.order.constants import PaymentEventTypeName
 from ecommerce.extensions.payment.core.sdn import SDNClient
 from ecommerce.extensions.payment.processors.cybersource import Cybersource
 from ecommerce.extensions.payment.tests.mixins import CybersourceMixin, CyberSourceRESTAPIMixin
+from ecommerce.extensions.payment.views.cybersource import CybersourceAuthorizeAPIView
 from ecommerce.extensions.test.factories import create_basket
 from ecommerce.tests.testcases import TestCase
 
@@ -283,7 +285,7 @@ class CybersourceAuthorizeViewTests(CyberSourceRESTAPIMixin, TestCase):
 
             assert response.status_code == 201
             assert response['content-type'] == JSON
-            assert json.loads(response.content)['receipt_page_url'] == get_receipt_page_url(
+            assert response.json()['receipt_page_url'] == get_receipt_page_url(
                 self.request,
                 self.site.siteconfiguration,
                 order_number=order_number,
@@ -315,7 +317,7 @@ class CybersourceAuthorizeViewTests(CyberSourceRESTAPIMixin, TestCase):
 
         assert response.status_code == 201
         assert response['content-type'] == JSON
-        assert json.loads(response.content)['receipt_page_url'] == get_receipt_page_url(
+        assert response.json()['receipt_page_url'] == get_receipt_page_url(
             self.request,
             self.site.siteconfiguration,
             order_number=order_number,
@@ -336,7 +338,7 @@ class CybersourceAuthorizeViewTests(CyberSourceRESTAPIMixin, TestCase):
         # The original basket is frozen, and the new basket is empty, so currentyl this triggers an error response
         assert response.status_code == 400
         assert response['content-type'] == JSON
-        assert json.loads(response.content) == {
+        assert response.json() == {
             'error': 'There was a problem retrieving your basket. Refresh the page to try again.',
             'field_errors': {
                 'basket': 'There was a problem retrieving your basket. Refresh the page to try again.'
@@ -367,13 +369,30 @@ class CybersourceAuthorizeViewTests(CyberSourceRESTAPIMixin, TestCase):
 
         request = RequestFactory(SERVER_NAME='testserver.fake').post(self.path, data)
         request.site = self.site
-        assert json.loads(response.content)['redirectTo'] == get_payment_microfrontend_or_basket_url(request)
+        assert response.json()['redirectTo'] == get_payment_microfrontend_or_basket_url(request)
 
         # Ensure the basket is frozen
         basket = Basket.objects.get(pk=basket.pk)
         self.assertEqual(basket.status, Basket.MERGED)
         assert Basket.objects.count() == 2
 
+    def test_merge_already_merged_basket(self):
+        """ Verify a basket that was already merged after a decline is not merged into another new basket. """
+        basket = self._create_valid_basket()
+        basket.status = Basket.MERGED
+        basket.save()
+
+        view = CybersourceAuthorizeAPIView()
+        view.basket_id = basket.id
+        with mock.patch.object(
+            Basket.objects, 'select_for_update', wraps=Basket.objects.select_for_update
+        ) as mock_select_for_update:
+            view._merge_old_basket_into_new()  # pylint: disable=protected-access
+
+        # The lock must not use of=..., which MySQL 5.7 and MariaDB do not support.
+        mock_select_for_update.assert_called_once_with()
+        assert Basket.objects.count() == 1
+
     @freeze_time('2016-01-01')
     def test_authorized_pending_review_request(self):
         """ Verify the view reports an error if the transaction is only authorized pending review. """
@@ -397,7 +416,7 @@ class CybersourceAuthorizeViewTests(CyberSourceRESTAPIMixin, TestCase):
 
         request = RequestFactory(SERVER_NAME='testserver.fake').post(self.path, data)
         request.site = self.site
-        assert json.loads(response.content)['redirectTo'] == get_payment_microfrontend_or_basket_url(request)
+        assert response.json()['redirectTo'] == get_payment_microfrontend_or_basket_url(request)
 
         # Ensure the basket is frozen
         basket = Basket.objects.get(pk=basket.pk)
@@ -435,7 +454,7 @@ class CybersourceAuthorizeViewTests(CyberSourceRESTAPIMixin, TestCase):
 
         request = RequestFactory(SERVER_NAME='testserver.fake').post(self.path, data)
         request.site = self.site
-        assert json.loads(response.content)['redirectTo'] == get_payment_microfrontend_or_basket_url(request)
+        assert response.json()['redirectTo'] == get_payment_microfrontend_or_basket_url(request)
 
         # Ensure the basket is frozen
         basket = Basket.objects.get(pk=basket.pk)
@@ -461,7 +480,7 @@ class CybersourceAuthorizeViewTests(CyberSourceRESTAPIMixin, TestCase):
 
         assert response.status_code == 400
         assert response['content-type'] == JSON
-        assert json.loads(response.content) == {}
+        assert response.json() == {}
 
         # Ensure the basket is frozen
         basket = Basket.objects.get(pk=basket.pk)
@@ -532,6 +551,16 @@ class ApplePayStartSessionViewTests(LoginMixin, TestCase):
             request_from_mfe and enable_microfrontend,
         )
 
+    @responses.activate
+    def test_post_timeout(self):
+        """ The view should return HTTP 504 if Apple does not respond in time. """
+        url = 'https://apple-pay-gateway.apple.com/paymentservices/startSession'
+        responses.add(responses.POST, url, body=requests.exceptions.ReadTimeout())
+
+        response = self.client.post(self.url, json.dumps({'url': url}), JSON)
+        self.assertEqual(response.status_code, 504)
+        self.assertEqual(response.json(), {'error': 'apple_pay_session_timeout'})
+
     def test_post_without_url(self):
         """ The view should return HTTP 400 if no url parameter is posted. """
         response = self.client.post(self.url)
@@ -544,7 +573,9 @@ class CybersourceApplePayAuthorizationViewTests(LoginMixin, CybersourceMixin, Te
     url = reverse('cybersource:apple_pay:authorize')
 
     def generate_post_data(self):
-        address = factories.BillingAddressFactory()
+        # Only the address fields are posted, so the address itself does not need to be saved. The view does look up
+        # the country, however, so that still has to exist.
+        address = factories.BillingAddressFactory.build(country=factories.CountryFactory())
 
         return {
             'billingContact': {
@@ -1,23 +1,27 @@
 import json
+import os
 
 import stripe
 from ddt import ddt, file_data
-from django.conf import settings
+from django.db.models import Prefetch
 from django.urls import reverse
 from mock import mock
 from oscar.core.loading import get_class, get_model
 from rest_framework import status
 
-from ecommerce.core.constants import SEAT_PRODUCT_CLASS_NAME
 from ecommerce.courses.tests.factories import CourseFactory
 from ecommerce.extensions.checkout.utils import get_receipt_page_url
 from ecommerce.extensions.order.constants import PaymentEventTypeName
 from ecommerce.extensions.payment.constants import STRIPE_CARD_TYPE_MAP
 from ecommerce.extensions.payment.processors.stripe import Stripe
 from ecommerce.extensions.payment.tests.mixins import PaymentEventsMixin
+from ecommerce.extensions.payment.views.stripe import StripeCheckoutView
 from ecommerce.extensions.test.factories import create_basket
+from ecommerce.tests.factories import UserFactory
+from ecommerce.tests.mixins import LoginRequiredViewTestMixin
 from ecommerce.tests.testcases import TestCase
 
+Basket = get_model('basket', 'Basket')
 BasketAttribute = get_model('basket', 'BasketAttribute')
 BasketAttributeType = get_model('basket', 'BasketAttributeType')
 Country = get_model('address', 'Country')
@@ -28,25 +32,58 @@ Source = get_model('payment', 'Source')
 Product = get_model('catalogue', 'Product')
 PaymentProcessorResponse = get_model('payment', 'PaymentProcessorResponse')
 
-STRIPE_TEST_FIXTURE_PATH = 'ecommerce/extensions/payment/tests/views/fixtures/test_stripe_test_payment_flow.json'
+STRIPE_TEST_FIXTURE_PATH = os.path.join(os.path.dirname(__file__), 'fixtures', 'test_stripe_test_payment_flow.json')
 
 
 @ddt
-class StripeCheckoutViewTests(PaymentEventsMixin, TestCase):
-    path = reverse('stripe:submit')
+class StripeCheckoutViewTests(LoginRequiredViewTestMixin, PaymentEventsMixin, TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super(StripeCheckoutViewTests, cls).setUpClass()
+        # Resolve URLs once per class, after Django is fully configured, rather than at import time.
+        cls.path = reverse('stripe:submit')
+        cls.stripe_checkout_url = reverse('stripe:checkout')
+        cls.capture_context_url = reverse('bff:payment:v0:capture_context')
+
+        # The canned Stripe responses are only read by the views, so parse the fixture file once per class.
+        with open(STRIPE_TEST_FIXTURE_PATH, 'r') as fixtures:  # pylint: disable=unspecified-encoding
+            cls.fixture_data = json.load(fixtures)['happy_path']
+
+    @classmethod
+    def setUpTestData(cls):
+        super(StripeCheckoutViewTests, cls).setUpTestData()
+        # None of these tests modify the user, so create it once for the whole class.
+        cls.user = UserFactory(password=cls.password, lms_user_id=cls.lms_user_id)
+        # The billing address returned by the mocked Stripe API is in the US.
+        Country.objects.create(iso_3166_1_a2='US', name='US')
 
     def setUp(self):
         super(StripeCheckoutViewTests, self).setUp()
-        self.user = self.create_user()
-        self.client.login(username=self.user.username, password=self.password)
+        self.client.force_login(self.user)
         self.site.siteconfiguration.client_side_payment_processor = 'stripe'
         self.site.siteconfiguration.save()
-        Country.objects.create(iso_3166_1_a2='US', name='US')
         self.mock_enrollment_api_resp = mock.Mock()
         self.mock_enrollment_api_resp.status_code = status.HTTP_200_OK
 
-        self.stripe_checkout_url = reverse('stripe:checkout')
-        self.capture_context_url = reverse('bff:payment:v0:capture_context')
+        # Stub out every Stripe PaymentIntent call and the enrollment API for the whole test, so that no test can
+        # reach the network. Individual tests only need to configure the canned responses they care about.
+        stripe_patcher = mock.patch.multiple(
+            stripe.PaymentIntent,
+            create=mock.DEFAULT,
+            retrieve=mock.DEFAULT,
+            confirm=mock.DEFAULT,
+            modify=mock.DEFAULT,
+        )
+        self.stripe_mocks = stripe_patcher.start()
+        self.addCleanup(stripe_patcher.stop)
+
+        enrollment_patcher = mock.patch(
+            'ecommerce.extensions.fulfillment.modules.EnrollmentFulfillmentModule._post_to_enrollment_api',
+            return_value=self.mock_enrollment_api_resp
+        )
+        enrollment_patcher.start()
+        self.addCleanup(enrollment_patcher.stop)
 
     def payment_flow_with_mocked_stripe_calls(
             self,
@@ -57,50 +94,30 @@ class StripeCheckoutViewTests(PaymentEventsMixin, TestCase):
             confirm_side_effect=None,
             modify_side_effect=None):
         """
-        Helper function to mock all stripe calls with successful responses.
-
-        Useful for when you want to mock something else without a wall
-        of context managers in your test.
+        Helper function to run the capture-context and checkout calls with
+        successful Stripe responses, unless a side effect is provided.
         """
-        # Requires us to run tests from repo root directory. Too fragile?
-        with open(STRIPE_TEST_FIXTURE_PATH, 'r') as fixtures:  # pylint: disable=unspecified-encoding
-            fixture_data = json.load(fixtures)['happy_path']
-
-        # hit capture_context first
-        with mock.patch('stripe.PaymentIntent.create') as mock_create:
-            if create_side_effect is not None:
-                mock_create.side_effect = create_side_effect
-            else:
-                mock_create.side_effect = [fixture_data['create_resp']]
-            self.client.get(self.capture_context_url)
-
-        # now hit POST endpoint
-        with mock.patch('stripe.PaymentIntent.retrieve') as mock_retrieve:
-            if retrieve_side_effect is not None:
-                mock_retrieve.side_effect = retrieve_side_effect
-            else:
-                mock_retrieve.side_effect = [fixture_data['retrieve_addr_resp']]
-
-            with mock.patch(
-                'ecommerce.extensions.fulfillment.modules.EnrollmentFulfillmentModule._post_to_enrollment_api'
-            ) as mock_api_resp:
-                mock_api_resp.return_value = self.mock_enrollment_api_resp
-
-                with mock.patch('stripe.PaymentIntent.confirm') as mock_confirm:
-                    if confirm_side_effect is not None:
-                        mock_confirm.side_effect = confirm_side_effect
-                    else:
-                        mock_confirm.side_effect = [fixture_data['confirm_resp']]
-                    with mock.patch('stripe.PaymentIntent.modify') as mock_modify:
-                        if modify_side_effect is not None:
-                            mock_modify.side_effect = modify_side_effect
-                        else:
-                            mock_modify.side_effect = [fixture_data['modify_resp']]
-                        # make your call
-                        return self.client.post(
-                            url,
-                            data=data
-                        )
+        def _side_effect(side_effect, fixture_key):
+            return side_effect if side_effect is not None else [self.fixture_data[fixture_key]]
+
+        self.stripe_mocks['create'].side_effect = _side_effect(create_side_effect, 'create_resp')
+        self.stripe_mocks['retrieve'].side_effect = _side_effect(retrieve_side_effect, 'retrieve_addr_resp')
+        self.stripe_mocks['confirm'].side_effect = _side_effect(confirm_side_effect, 'confirm_resp')
+        self.stripe_mocks['modify'].side_effect = _side_effect(modify_side_effect, 'modify_resp')
+
+        # hit capture_context first, then the POST endpoint
+        self.client.get(self.capture_context_url)
+        return self.client.post(
+            url,
+            data=data
+        )
+
+    def get_checkout_data(self, basket, skus=None):
+        """ Build the checkout POST data for the given basket before any view code is patched. """
+        return {
+            'payment_intent_id': 'pi_3LsftNIadiFyUl1x2TWxaADZ',
+            'skus': basket.lines.first().stockrecord.partner_sku if skus is None else skus,
+        }
 
     def assert_successful_order_response(self, response, order_number):
         assert response.status_code == 201
@@ -113,40 +130,37 @@ class StripeCheckoutViewTests(PaymentEventsMixin, TestCase):
         assert response.json() == {'url': receipt_url}
 
     def assert_order_created(self, basket, billing_address, card_type, label):
-        order = Order.objects.get(number=basket.order_number, total_incl_tax=basket.total_incl_tax)
+        order = Order.objects.select_related('billing_address').prefetch_related(
+            Prefetch('payment_events', queryset=PaymentEvent.objects.select_related('event_type')),
+            Prefetch('sources', queryset=Source.objects.select_related('source_type')),
+        ).get(number=basket.order_number, total_incl_tax=basket.total_incl_tax)
         total = order.total_incl_tax
-        order.payment_events.get(event_type__code='paid', amount=total)
-        Source.objects.get(
-            source_type__name=Stripe.NAME,
-            currency=order.currency,
-            amount_allocated=total,
-            amount_debited=total,
-            card_type=STRIPE_CARD_TYPE_MAP[card_type],
-            label=label
-        )
-        PaymentEvent.objects.get(
-            event_type__name=PaymentEventTypeName.PAID,
-            amount=total,
-            processor_name=Stripe.NAME
-        )
+
+        paid_events = [
+            event for event in order.payment_events.all()
+            if event.event_type.code == 'paid' and event.event_type.name == PaymentEventTypeName.PAID and
+            event.amount == total and event.processor_name == Stripe.NAME
+        ]
+        assert len(paid_events) == 1
+
+        sources = [
+            source for source in order.sources.all()
+            if (source.source_type.name, source.currency, source.amount_allocated, source.amount_debited,
+                source.card_type, source.label) == (
+                    Stripe.NAME, order.currency, total, total, STRIPE_CARD_TYPE_MAP[card_type], label)
+        ]
+        assert len(sources) == 1
         assert order.billing_address == billing_address
 
-    def create_basket(self, product_class=None):
-        basket = create_basket(owner=self.user, site=self.site, product_class=product_class)
+    def create_basket(self):
+        # Start from an empty basket; the default product would only be flushed and replaced by the seat below.
+        basket = create_basket(owner=self.user, site=self.site, empty=True)
         basket.strategy = Selector().strategy()
-        basket.thaw()
-        basket.flush()
         course = CourseFactory()
         seat = course.create_or_update_seat('credit', False, 100, 'credit_provider_id', None, 2)
         basket.add_product(seat, 1)
         return basket
 
-    def test_login_required(self):
-        self.client.logout()
-        response = self.client.post(self.path)
-        expected_url = '{base}?next={path}'.format(base=reverse(settings.LOGIN_URL), path=self.path)
-        self.assertRedirects(response, expected_url, fetch_redirect_response=False)
-
     @file_data('fixtures/test_stripe_test_payment_flow.json')
     def test_payment_flow(
             self,
@@ -167,39 +181,25 @@ class StripeCheckoutViewTests(PaymentEventsMixin, TestCase):
             retrieve_addr_resp: Response for retrieve call that should be made when getting billing address
             confirm_resp: Response for confirm call that should be made when handling processor response
         """
-        basket = self.create_basket(product_class=SEAT_PRODUCT_CLASS_NAME)
+        basket = self.create_basket()
         idempotency_key = f'basket_pi_create_v1_{basket.order_number}'
 
         # need to call capture-context endpoint before we call do GET to the stripe checkout view
         # so that the PaymentProcessorResponse is already created
-        with mock.patch('stripe.PaymentIntent.create') as mock_create:
-            mock_create.return_value = create_resp
-            self.client.get(self.capture_context_url)
-            mock_create.assert_called_once()
-            assert mock_create.call_args.kwargs['idempotency_key'] == idempotency_key
-
-        with mock.patch('stripe.PaymentIntent.retrieve') as mock_retrieve:
-            mock_retrieve.return_value = retrieve_addr_resp
-
-            with mock.patch(
-                'ecommerce.extensions.fulfillment.modules.EnrollmentFulfillmentModule._post_to_enrollment_api'
-            ) as mock_api_resp:
-                mock_api_resp.return_value = self.mock_enrollment_api_resp
-
-                with mock.patch('stripe.PaymentIntent.confirm') as mock_confirm:
-                    mock_confirm.return_value = confirm_resp
-                    with mock.patch('stripe.PaymentIntent.modify') as mock_modify:
-                        mock_modify.return_value = modify_resp
-                        self.client.post(
-                            self.stripe_checkout_url,
-                            data={
-                                'payment_intent_id': 'pi_3LsftNIadiFyUl1x2TWxaADZ',
-                                'skus': basket.lines.first().stockrecord.partner_sku,
-                            },
-                        )
-                assert mock_retrieve.call_count == 1
-                assert mock_modify.call_count == 1
-                assert mock_confirm.call_count == 1
+        mock_create = self.stripe_mocks['create']
+        mock_create.return_value = create_resp
+        self.client.get(self.capture_context_url)
+        mock_create.assert_called_once()
+        assert mock_create.call_args.kwargs['idempotency_key'] == idempotency_key
+
+        self.stripe_mocks['retrieve'].return_value = retrieve_addr_resp
+        self.stripe_mocks['confirm'].return_value = confirm_resp
+        self.stripe_mocks['modify'].return_value = modify_resp
+        data = self.get_checkout_data(basket)
+        self.client.post(self.stripe_checkout_url, data=data)
+        assert self.stripe_mocks['retrieve'].call_count == 1
+        assert self.stripe_mocks['modify'].call_count == 1
+        assert self.stripe_mocks['confirm'].call_count == 1
 
         # Verify BillingAddress was set correctly
         basket.refresh_from_db()
@@ -219,6 +219,45 @@ class StripeCheckoutViewTests(PaymentEventsMixin, TestCase):
         # created when andle_processor_response is successful
         assert pprs.count() == 1
 
+    def test_retried_payment_returns_receipt(self):
+        """
+        Verify that submitting an already paid basket again returns the receipt page
+        without confirming the payment intent with Stripe a second time.
+        """
+        basket = self.create_basket()
+        data = self.get_checkout_data(basket)
+        response = self.payment_flow_with_mocked_stripe_calls(self.stripe_checkout_url, data)
+        assert response.status_code == 201
+
+        select_for_update_patcher = mock.patch.object(
+            Basket.objects, 'select_for_update', wraps=Basket.objects.select_for_update
+        )
+        applicator_patcher = mock.patch('ecommerce.extensions.payment.views.stripe.Applicator')
+        processed_patcher = mock.patch.object(
+            StripeCheckoutView, '_basket_already_processed', autospec=True,
+            side_effect=StripeCheckoutView._basket_already_processed,
+        )
+        with select_for_update_patcher as mock_select_for_update, applicator_patcher as mock_applicator:
+            with processed_patcher as mock_already_processed:
+                response = self.client.post(self.stripe_checkout_url, data=data)
+
+        # The basket is locked before any offer or attribute work, which is skipped for the submitted basket.
+        # The order lookup runs only once per submission.
+        mock_select_for_update.assert_called_once_with()
+        mock_applicator.assert_not_called()
+        mock_already_processed.assert_called_once()
+        assert response.status_code == 201
+        assert response.json() == {
+            'receipt_page_url': get_receipt_page_url(
+                self.request,
+                order_number=basket.order_number,
+                site_configuration=self.site_configuration,
+                disable_back_button=True,
+            ),
+        }
+        assert self.stripe_mocks['confirm'].call_count == 1
+        assert Order.objects.filter(basket=basket).count() == 1
+
     def test_capture_context_basket_price_change(self):
         """
         Verify that existing payment intent is retrieved,
@@ -226,17 +265,17 @@ class StripeCheckoutViewTests(PaymentEventsMixin, TestCase):
         context is called to generate stripe elements, but then user backs out from
         payment page, and tries to check out with a different things in the basket.
         """
-        basket = self.create_basket(product_class=SEAT_PRODUCT_CLASS_NAME)
+        basket = self.create_basket()
         idempotency_key = f'basket_pi_create_v1_{basket.order_number}'
 
-        with mock.patch('stripe.PaymentIntent.create') as mock_create:
-            mock_create.return_value = {
-                'id': 'pi_3LsftNIadiFyUl1x2TWxaADZ',
-                'client_secret': 'pi_3LsftNIadiFyUl1x2TWxaADZ_secret_VxRx7Y1skyp0jKtq7Gdu80Xnh',
-            }
-            self.client.get(self.capture_context_url)
-            mock_create.assert_called_once()
-            assert mock_create.call_args.kwargs['idempotency_key'] == idempotency_key
+        mock_create = self.stripe_mocks['create']
+        mock_create.return_value = {
+            'id': 'pi_3LsftNIadiFyUl1x2TWxaADZ',
+            'client_secret': 'pi_3LsftNIadiFyUl1x2TWxaADZ_secret_VxRx7Y1skyp0jKtq7Gdu80Xnh',
+        }
+        self.client.get(self.capture_context_url)
+        mock_create.assert_called_once()
+        assert mock_create.call_args.kwargs['idempotency_key'] == idempotency_key
 
         # Verify there is 1 and only 1 Basket Attribute with the payment_intent_id
         # associated with our basket.
@@ -252,39 +291,37 @@ class StripeCheckoutViewTests(PaymentEventsMixin, TestCase):
         basket.add_product(seat, 1)
         basket.save()
 
-        with mock.patch('stripe.PaymentIntent.create') as mock_create:
-            mock_create.side_effect = stripe.error.IdempotencyError
-
-            with mock.patch('stripe.PaymentIntent.retrieve') as mock_retrieve:
-                mock_retrieve.return_value = {
-                    'id': 'pi_3LsftNIadiFyUl1x2TWxaADZ',
-                    'client_secret': 'pi_3LsftNIadiFyUl1x2TWxaADZ_secret_VxRx7Y1skyp0jKtq7Gdu80Xnh',
-                }
-                self.client.get(self.capture_context_url)
-                mock_retrieve.assert_called_once()
-                assert mock_retrieve.call_args.kwargs['id'] == 'pi_3LsftNIadiFyUl1x2TWxaADZ'
+        mock_create.side_effect = stripe.error.IdempotencyError
+        mock_retrieve = self.stripe_mocks['retrieve']
+        mock_retrieve.return_value = {
+            'id': 'pi_3LsftNIadiFyUl1x2TWxaADZ',
+            'client_secret': 'pi_3LsftNIadiFyUl1x2TWxaADZ_secret_VxRx7Y1skyp0jKtq7Gdu80Xnh',
+        }
+        self.client.get(self.capture_context_url)
+        mock_retrieve.assert_called_once()
+        assert mock_retrieve.call_args.kwargs['id'] == 'pi_3LsftNIadiFyUl1x2TWxaADZ'
 
     def test_capture_context_empty_basket(self):
         basket = create_basket(owner=self.user, site=self.site)
         basket.flush()
 
-        with mock.patch('stripe.PaymentIntent.create') as mock_create:
-            mock_create.return_value = {
-                'id': '',
-                'client_secret': '',
-            }
+        mock_create = self.stripe_mocks['create']
+        mock_create.return_value = {
+            'id': '',
+            'client_secret': '',
+        }
 
-            self.assertTrue(basket.is_empty)
-            response = self.client.get(self.capture_context_url)
+        self.assertTrue(basket.is_empty)
+        response = self.client.get(self.capture_context_url)
 
-            mock_create.assert_not_called()
-            self.assertDictEqual(response.json(), {
-                'capture_context': {
-                    'key_id': mock_create.return_value['client_secret'],
-                    'order_id': basket.order_number,
-                }
-            })
-            self.assertEqual(response.status_code, 200)
+        mock_create.assert_not_called()
+        self.assertDictEqual(response.json(), {
+            'capture_context': {
+                'key_id': mock_create.return_value['client_secret'],
+                'order_id': basket.order_number,
+            }
+        })
+        self.assertEqual(response.status_code, 200)
 
     def test_payment_error_no_basket(self):
         """
@@ -305,16 +342,11 @@ class StripeCheckoutViewTests(PaymentEventsMixin, TestCase):
         """
         Verify a sku mismatch between basket and request logs warning.
         """
-        basket = self.create_basket(product_class=SEAT_PRODUCT_CLASS_NAME)
+        basket = self.create_basket()
 
+        data = self.get_checkout_data(basket, skus='totally_the_wrong_sku')
         with self.assertLogs(level='WARNING') as log:
-            response = self.payment_flow_with_mocked_stripe_calls(
-                self.stripe_checkout_url,
-                {
-                    'payment_intent_id': 'pi_3LsftNIadiFyUl1x2TWxaADZ',
-                    'skus': 'totally_the_wrong_sku',
-                },
-            )
+            response = self.payment_flow_with_mocked_stripe_calls(self.stripe_checkout_url, data)
             assert response.json() == {'sku_error': True}
             assert response.status_code == 400
             expected_log = (
@@ -326,79 +358,53 @@ class StripeCheckoutViewTests(PaymentEventsMixin, TestCase):
             actual_log = log.output[0]
             assert actual_log == expected_log
 
+    @mock.patch('ecommerce.extensions.payment.views.stripe.checkSDN', mock.Mock(return_value=1))
     def test_payment_check_sdn_returns_hits(self):
         """
         Verify positive SDN hits returns correct error JSON.
         """
-        basket = self.create_basket(product_class=SEAT_PRODUCT_CLASS_NAME)
-
-        with mock.patch('ecommerce.extensions.payment.views.stripe.checkSDN') as mock_sdn_check:
-            mock_sdn_check.return_value = 1
-            response = self.payment_flow_with_mocked_stripe_calls(
-                self.stripe_checkout_url,
-                {
-                    'payment_intent_id': 'pi_3LsftNIadiFyUl1x2TWxaADZ',
-                    'skus': basket.lines.first().stockrecord.partner_sku,
-                },
-            )
-            assert response.status_code == 400
-            assert response.json() == {'sdn_check_failure': {'hit_count': 1}}
+        basket = self.create_basket()
+
+        response = self.payment_flow_with_mocked_stripe_calls(self.stripe_checkout_url, self.get_checkout_data(basket))
+        assert response.status_code == 400
+        assert response.json() == {'sdn_check_failure': {'hit_count': 1}}
 
     def test_handle_payment_fails_with_carderror(self):
         """
         Verify handle payment failing with CardError returns correct error JSON.
         """
-        basket = self.create_basket(product_class=SEAT_PRODUCT_CLASS_NAME)
+        basket = self.create_basket()
 
         response = self.payment_flow_with_mocked_stripe_calls(
             self.stripe_checkout_url,
-            {
-                'payment_intent_id': 'pi_3LsftNIadiFyUl1x2TWxaADZ',
-                'skus': basket.lines.first().stockrecord.partner_sku,
-            },
+            self.get_checkout_data(basket),
             confirm_side_effect=stripe.error.CardError('Oops!', {}, 'card_declined'),
         )
         assert response.status_code == 400
         assert response.json() == {'error_code': 'card_declined', 'user_message': 'Oops!'}
 
+    @mock.patch.object(StripeCheckoutView, 'handle_payment', mock.Mock(side_effect=ZeroDivisionError))
     def test_handle_payment_fails_with_unexpected_error(self):
         """
         Verify handle payment failing with unexpected error returns correct JSON response.
         """
-        basket = self.create_basket(product_class=SEAT_PRODUCT_CLASS_NAME)
-
-        path = 'ecommerce.extensions.payment.views.stripe.StripeCheckoutView.handle_payment'
-        with mock.patch(path) as mock_handle_payment:
-            mock_handle_payment.side_effect = ZeroDivisionError
-            response = self.payment_flow_with_mocked_stripe_calls(
-                self.stripe_checkout_url,
-                {
-                    'payment_intent_id': 'pi_3LsftNIadiFyUl1x2TWxaADZ',
-                    'skus': basket.lines.first().stockrecord.partner_sku,
-                },
-            )
-            assert response.status_code == 400
-            assert response.json() == {}
+        basket = self.create_basket()
 
+        response = self.payment_flow_with_mocked_stripe_calls(self.stripe_checkout_url, self.get_checkout_data(basket))
+        assert response.status_code == 400
+        assert response.json() == {}
+
+    @mock.patch.object(StripeCheckoutView, 'create_billing_address', mock.Mock(side_effect=Exception))
     def test_create_billing_address_fails(self):
         """
         Verify order is not successful if billing address objects fails
         to be created.
         """
-        basket = self.create_basket(product_class=SEAT_PRODUCT_CLASS_NAME)
-
-        path = 'ecommerce.extensions.payment.views.stripe.StripeCheckoutView.create_billing_address'
-        with mock.patch(path) as mock_billing_create:
-            mock_billing_create.side_effect = Exception
-            response = self.payment_flow_with_mocked_stripe_calls(
-                self.stripe_checkout_url,
-                {
-                    'payment_intent_id': 'pi_3LsftNIadiFyUl1x2TWxaADZ',
-                    'skus': basket.lines.first().stockrecord.partner_sku,
-                },
-            )
-            assert response.status_code == 400
-            assert response.json() == {}
+        basket = self.create_basket()
+
+        response = self.payment_flow_with_mocked_stripe_calls(self.stripe_checkout_url, self.get_checkout_data(basket))
+        assert response.status_code == 400
+        assert response.json() == {}
 
         basket.refresh_from_db()
         assert not basket.order_set.exists()
@@ -1,9 +1,10 @@
 import logging
-import re
 from urllib.parse import urljoin
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.utils.translation import ugettext_lazy as _
+from edx_django_utils.cache import TieredCache
 from oscar.core.loading import get_model
 
 from ecommerce.core.constants import SEAT_PRODUCT_CLASS_NAME
@@ -13,8 +14,12 @@ logger = logging.getLogger(__name__)
 Basket = get_model('basket', 'Basket')
 BasketAttribute = get_model('basket', 'BasketAttribute')
 BasketAttributeType = get_model('basket', 'BasketAttributeType')
+Country = get_model('address', 'Country')
 User = get_user_model()
 
+# Translation table used by clean_field_value to drop special characters in a single pass.
+CLEAN_FIELD_VALUE_TRANSLATION = str.maketrans('', '', '^:"\'')
+
 
 def get_basket_program_uuid(basket):
     """
@@ -98,7 +103,33 @@ def clean_field_value(value):
     Returns:
         A cleaned string.
     """
-    return re.sub(r'[\^:"\']', '', value)
+    return value.translate(CLEAN_FIELD_VALUE_TRANSLATION)
+
+
+def get_country_by_code(code):
+    """
+    Return the Country for the given ISO 3166-1 alpha-2 code.
+
+    Countries never change at runtime, so the result is cached to avoid a database query for every payment.
+
+    Arguments:
+        code (str): The two-letter country code, in any case.
+
+    Returns:
+        Country
+
+    Raises:
+        Country.DoesNotExist: When no country matches the code.
+    """
+    cache_key = 'country_{code}'.format(code=code).lower()
+    country_cached_response = TieredCache.get_cached_response(cache_key)
+    if country_cached_response.is_found:
+        return country_cached_response.value
+
+    country = Country.objects.get(iso_3166_1_a2__iexact=code)
+
+    TieredCache.set_all_tiers(cache_key, country, settings.COUNTRY_CACHE_TIMEOUT)
+    return country
 
 
 def embargo_check(user, site, products, ip=None):
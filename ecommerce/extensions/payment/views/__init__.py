@@ -42,11 +42,12 @@ class BasePaymentSubmitView(View):
 
     @method_decorator(login_required)
     def dispatch(self, request, *args, **kwargs):
+        basket = request.basket
         logger.info(
             '%s called for basket [%d]. It is in the [%s] state.',
             self.__class__.__name__,
-            request.basket.id,
-            request.basket.status
+            basket.id,
+            basket.status
         )
         return super(BasePaymentSubmitView, self).dispatch(request, *args, **kwargs)
 
@@ -5,6 +5,7 @@ from typing import Optional
 import requests
 from django.contrib import messages
 from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
 from django.http import JsonResponse
 from django.utils.functional import cached_property
 from django.utils.translation import ugettext as _
@@ -12,6 +13,7 @@ from edx_django_utils import monitoring as monitoring_utils
 from oscar.apps.partner import strategy
 from oscar.apps.payment.exceptions import GatewayError, PaymentError, TransactionDeclined, UserCancelled
 from oscar.core.loading import get_class, get_model
+from requests.adapters import HTTPAdapter
 from rest_framework import permissions, status
 from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
@@ -36,6 +38,7 @@ from ecommerce.extensions.payment.exceptions import (
     RedundantPaymentNotificationError
 )
 from ecommerce.extensions.payment.processors.cybersource import Cybersource, CybersourceREST
+from ecommerce.extensions.payment.utils import get_country_by_code
 from ecommerce.extensions.payment.views import BasePaymentSubmitView
 
 logger = logging.getLogger(__name__)
@@ -49,10 +52,16 @@ BUNDLE = 'bundle_identifier'
 Country = get_model('address', 'Country')
 NoShippingRequired = get_class('shipping.methods', 'NoShippingRequired')
 Order = get_model('order', 'Order')
-OrderNumberGenerator = get_class('order.utils', 'OrderNumberGenerator')
 OrderTotalCalculator = get_class('checkout.calculators', 'OrderTotalCalculator')
 PaymentProcessorResponse = get_model('payment', 'PaymentProcessorResponse')
 
+# Apple Pay session requests are authenticated with a client certificate. Sharing one pooled session across requests
+# keeps those connections alive, so each call does not pay for a fresh mutual-TLS handshake.
+apple_pay_session = requests.Session()
+apple_pay_session.mount('https://', HTTPAdapter(pool_connections=10, pool_maxsize=50))
+# (connect, read) timeout, in seconds, for the start-session call, so a hung Apple endpoint cannot pin a worker.
+APPLE_PAY_START_SESSION_TIMEOUT = (3.05, 10)
+
 
 class CyberSourceProcessorMixin:
     @cached_property
@@ -301,7 +310,7 @@ class CybersourceOrderCompletionView(EdxOrderPlacementMixin):
 
         try:
             basket_id = int(basket_id)
-            basket = Basket.objects.get(id=basket_id)
+            basket = Basket.objects.select_related('owner').get(id=basket_id)
             basket.strategy = strategy.Default()
 
             Applicator().apply(basket, basket.owner, self.request)
@@ -320,26 +329,36 @@ class CybersourceOrderCompletionView(EdxOrderPlacementMixin):
         Upon declined transaction merge old basket into new one and also copy bundle attibute
         over to new basket if any.
         """
-        old_basket_id = OrderNumberGenerator().basket_id(self.order_number)
-        old_basket = Basket.objects.get(id=old_basket_id)
-
-        bundle_attributes = BasketAttribute.objects.filter(
-            basket=old_basket,
-            attribute_type=BasketAttributeType.objects.get(name=BUNDLE)
-        )
-        bundle = bundle_attributes.first().value_text if bundle_attributes.count() > 0 else None
-
-        new_basket = Basket.objects.create(owner=old_basket.owner, site=self.request.site)
-
-        # We intentionally avoid thawing the old basket here to prevent order
-        # numbers from being reused. For more, refer to commit a1efc68.
-        new_basket.merge(old_basket, add_quantities=False)
-        if bundle:
-            BasketAttribute.objects.update_or_create(
-                basket=new_basket,
-                attribute_type=BasketAttributeType.objects.get(name=BUNDLE),
-                defaults={'value_text': bundle}
-            )
+        # The declined basket is the one this order number was generated for, and its ID is already on the view.
+        old_basket_id = self.basket_id
+
+        with transaction.atomic():
+            # Lock the old basket so concurrent declines for it cannot each create a new basket. Only the basket row
+            # is locked; the owner is loaded separately when the new basket is created.
+            old_basket = Basket.objects.select_for_update().get(id=old_basket_id)
+            if old_basket.status == Basket.MERGED:
+                logger.info(
+                    'Basket [%d] was already merged into a new basket for a declined transaction.',
+                    old_basket_id
+                )
+                return
+
+            bundle = BasketAttribute.objects.filter(
+                basket=old_basket,
+                attribute_type__name=BUNDLE
+            ).values_list('value_text', flat=True).first()
+
+            new_basket = Basket.objects.create(owner=old_basket.owner, site=self.request.site)
+
+            # We intentionally avoid thawing the old basket here to prevent order
+            # numbers from being reused. For more, refer to commit a1efc68.
+            new_basket.merge(old_basket, add_quantities=False)
+            if bundle:
+                BasketAttribute.objects.update_or_create(
+                    basket=new_basket,
+                    attribute_type=BasketAttributeType.objects.get(name=BUNDLE),
+                    defaults={'value_text': bundle}
+                )
 
         logger.info(
             'Created new basket [%d] from old basket [%d] for declined transaction with bundle [%s].',
@@ -419,11 +438,12 @@ class CybersourceAuthorizeAPIView(
     data: dict
 
     def post(self, request):
+        basket = request.basket
         logger.info(
             '%s called for basket [%d]. It is in the [%s] state.',
             self.__class__.__name__,
-            request.basket.id,
-            request.basket.status
+            basket.id,
+            basket.status
         )
         return super(CybersourceAuthorizeAPIView, self).post(request)
 
@@ -506,7 +526,16 @@ class ApplePayStartSessionView(CyberSourceProcessorMixin, APIView):
             'displayName': request.site.name,
         }
 
-        response = requests.post(url, json=data, cert=self.payment_processor.apple_pay_merchant_id_certificate_path)
+        try:
+            response = apple_pay_session.post(
+                url,
+                json=data,
+                cert=self.payment_processor.apple_pay_merchant_id_certificate_path,
+                timeout=APPLE_PAY_START_SESSION_TIMEOUT,
+            )
+        except requests.exceptions.Timeout:
+            logger.warning('Timed out while starting Apple Pay session with [%s].', url)
+            return JsonResponse({'error': 'apple_pay_session_timeout'}, status=504)
 
         if response.status_code > 299:
             logger.warning('Failed to start Apple Pay session. [%s] returned status [%d] with content %s',
@@ -528,7 +557,7 @@ class CybersourceApplePayAuthorizationView(CyberSourceProcessorMixin, EdxOrderPl
         country_code = order_completion_message.get('countryCode')
 
         try:
-            country = Country.objects.get(iso_3166_1_a2__iexact=country_code)
+            country = get_country_by_code(country_code)
         except Country.DoesNotExist:
             logger.warning('Country matching code [%s] does not exist.', country_code)
             raise
@@ -6,6 +6,7 @@ from django.core.exceptions import MultipleObjectsReturned, ObjectDoesNotExist
 from django.db import transaction
 from django.http import JsonResponse
 from django.shortcuts import redirect
+from django.utils.functional import cached_property
 from oscar.apps.partner import strategy
 from oscar.core.loading import get_class, get_model
 from rest_framework.permissions import IsAuthenticated
@@ -24,11 +25,13 @@ from ecommerce.extensions.payment.views import BasePaymentSubmitView
 logger = logging.getLogger(__name__)
 
 Applicator = get_class('offer.applicator', 'Applicator')
+Basket = get_model('basket', 'Basket')
 BasketAttribute = get_model('basket', 'BasketAttribute')
 BasketAttributeType = get_model('basket', 'BasketAttributeType')
 BillingAddress = get_model('order', 'BillingAddress')
 Country = get_model('address', 'Country')
 NoShippingRequired = get_class('shipping.methods', 'NoShippingRequired')
+Order = get_model('order', 'Order')
 OrderTotalCalculator = get_class('checkout.calculators', 'OrderTotalCalculator')
 PaymentProcessorResponse = get_model('payment', 'PaymentProcessorResponse')
 
@@ -41,7 +44,7 @@ class StripeSubmitView(EdxOrderPlacementMixin, BasePaymentSubmitView):
     """
     form_class = StripeSubmitForm
 
-    @property
+    @cached_property
     def payment_processor(self):
         return Stripe(self.request.site)
 
@@ -84,7 +87,7 @@ class StripeCheckoutView(EdxOrderPlacementMixin, APIView):
     # making Stripe checkout submit requests.
     permission_classes = [IsAuthenticated]
 
-    @property
+    @cached_property
     def payment_processor(self):
         return Stripe(self.request.site)
 
@@ -115,6 +118,10 @@ class StripeCheckoutView(EdxOrderPlacementMixin, APIView):
         )
         return None
 
+    def _basket_already_processed(self, basket):
+        """ Return True if an earlier submission already placed an order for the basket. """
+        return basket.status == Basket.SUBMITTED and Order.objects.filter(basket=basket).exists()
+
     def _get_basket(self, payment_intent_id):
         """
         Retrieve a basket using a payment intent ID.
@@ -123,7 +130,8 @@ class StripeCheckoutView(EdxOrderPlacementMixin, APIView):
             payment_intent_id: payment_intent_id received from Stripe.
 
         Returns:
-            It will return related basket or log exception and return None if
+            A (basket, already_processed) tuple. already_processed is True if an earlier submission
+            already placed an order for the basket. It will log exception and return (None, False) if
             duplicate payment_intent_id* received or any other exception occurred.
         """
         try:
@@ -134,35 +142,40 @@ class StripeCheckoutView(EdxOrderPlacementMixin, APIView):
                 attribute_type=payment_intent_id_attribute,
                 value_text=payment_intent_id,
             )
-            basket = basket_attribute.basket
-            basket.strategy = strategy.Default()
+            with transaction.atomic():
+                # Lock the basket row before doing any work on it, so that a concurrent retry of the same submission
+                # waits for the first one to commit and then finds the basket already submitted.
+                basket = Basket.objects.select_for_update().get(id=basket_attribute.basket_id)
+                if self._basket_already_processed(basket):
+                    return basket, True
 
-            Applicator().apply(basket, basket.owner, self.request)
-            logger.info(
-                'Applicator applied, basket id: [%s]. Processed by [%s].',
-                basket.id, self.payment_processor.NAME)
+                basket.strategy = strategy.Default()
 
-            basket_add_organization_attribute(basket, self.request.GET)
+                Applicator().apply(basket, basket.owner, self.request)
+                logger.info(
+                    'Applicator applied, basket id: [%s]. Processed by [%s].',
+                    basket.id, self.payment_processor.NAME)
+
+                basket_add_organization_attribute(basket, self.request.GET)
         except MultipleObjectsReturned:
             logger.warning(u"Duplicate payment_intent_id [%s] received from Stripe.", payment_intent_id)
-            return None
+            return None, False
         except ObjectDoesNotExist:
             logger.warning(u"Could not find payment_intent_id [%s] among baskets.", payment_intent_id)
-            return None
+            return None, False
         except Exception:  # pylint: disable=broad-except
             logger.exception(u"Unexpected error during basket retrieval while executing Stripe payment.")
-            return None
-        return basket
+            return None, False
+        return basket, False
 
     def post(self, request):
         """
         Handle an incoming payment submission from the payment MFE after capture-context.
         SDN Check and confirmation by Stripe on the payment intent is performed.
         """
-        stripe_response = request.POST.dict()
-        payment_intent_id = stripe_response.get('payment_intent_id')
+        payment_intent_id = request.POST.get('payment_intent_id')
 
-        basket = self._get_basket(payment_intent_id)
+        basket, already_processed = self._get_basket(payment_intent_id)
 
         if not basket:
             logger.info(
@@ -174,12 +187,22 @@ class StripeCheckoutView(EdxOrderPlacementMixin, APIView):
         logger.info(
             '%s called for Stripe payment intent id [%s], basket [%d] with status [%s], and order number [%s].',
             self.__class__.__name__,
-            request.POST.get('payment_intent_id'),
+            payment_intent_id,
             basket.id,
             basket.status,
             basket.order_number,
         )
 
+        # A retried submission (e.g. a double-click or a client-side network retry) must not confirm the
+        # payment intent with Stripe again. Send it to the receipt page of the order the first submission created.
+        if already_processed:
+            logger.info(
+                'Stripe payment intent id [%s] for basket [%d] was already processed. Returning the receipt page.',
+                payment_intent_id,
+                basket.id,
+            )
+            return self.receipt_page_response(basket)
+
         # Check if skus in basket match what the frontend has
         # This is intended to prevent undesired behavior where a user opens up
         # 2 tabs in their browser to buy 2 courses, attempts to purchase the
@@ -195,7 +218,7 @@ class StripeCheckoutView(EdxOrderPlacementMixin, APIView):
         # to them. Let's hand those to the backend and verify what they think
         # they are buying matches what we have in the basket. If not, throw
         # an error and stop the purchase.
-        request_skus = stripe_response.get('skus')
+        request_skus = request.POST.get('skus')
         if request_skus:
             request_skus = set(request_skus.split(','))
             basket_skus = set(basket.lines.values_list(
@@ -228,7 +251,8 @@ class StripeCheckoutView(EdxOrderPlacementMixin, APIView):
         try:
             with transaction.atomic():
                 try:
-                    self.handle_payment(stripe_response, basket)
+                    # The processor only reads payment_intent_id, so the QueryDict is passed as-is.
+                    self.handle_payment(request.POST, basket)
                 except CardError as err:
                     return self.stripe_error_response(err)
         except:  # pylint: disable=bare-except
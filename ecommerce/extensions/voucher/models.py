@@ -5,6 +5,7 @@ import logging
 
 from django.core.exceptions import ObjectDoesNotExist
 from django.db import models
+from django.db.models import F
 from django.utils.translation import ugettext_lazy as _
 from oscar.apps.voucher.abstract_models import (  # pylint: disable=ungrouped-imports
     AbstractVoucher,
@@ -64,8 +65,32 @@ class Voucher(AbstractVoucher):
 
         return is_available, message
 
-    def save(self, *args, **kwargs):
+    def record_usage(self, order, user):
+        """
+        Records a usage of this voucher in an order.
+
+        Unlike Oscar's implementation, the order count is incremented in the database rather than by saving the
+        whole row, so concurrent redemptions of a popular code cannot overwrite each other's count.
+        """
+        if user.is_authenticated:
+            self.applications.create(voucher=self, order=order, user=user)
+        else:
+            self.applications.create(voucher=self, order=order)
+        Voucher.objects.filter(pk=self.pk).update(num_orders=F('num_orders') + 1)
+        self.num_orders += 1
+    record_usage.alters_data = True
+
+    def prepare_for_save(self):
+        """
+        Validate the voucher and normalize its code, as save() does.
+
+        bulk_create() does not call save(), so call this on every voucher before bulk creating it.
+        """
         self.clean()
+        self.code = self.code.upper()
+
+    def save(self, *args, **kwargs):
+        self.prepare_for_save()
         super(Voucher, self).save(*args, **kwargs)  # pylint: disable=bad-super-call
 
     def clean(self):
@@ -103,6 +128,14 @@ class Voucher(AbstractVoucher):
 
     @property
     def original_offer(self):
+        if 'offers' in getattr(self, '_prefetched_objects_cache', {}):
+            # Pick the offer from the prefetched offers, in their default order, instead of querying again.
+            offers = self.offers.all()
+            for offer in offers:
+                if offer.condition.range_id is not None:
+                    return offer
+            return sorted(offers, key=lambda offer: offer.date_created)[0]
+
         try:
             return self.offers.filter(condition__range__isnull=False)[0]
         except (IndexError, ObjectDoesNotExist):
@@ -82,6 +82,16 @@ class VoucherTests(TestCase):
         voucher.offers.add(third_offer)
         assert voucher.best_offer == second_offer
 
+    def test_original_offer_with_prefetched_offers(self):
+        """ Verify original_offer uses prefetched offers without querying the database again. """
+        voucher = factories.VoucherFactory()
+        offer = factories.ConditionalOfferFactory()
+        voucher.offers.add(offer)
+        voucher = Voucher.objects.prefetch_related('offers__condition').get(pk=voucher.pk)
+
+        with self.assertNumQueries(0):
+            assert voucher.original_offer == offer
+
     def test_create_voucher_with_multi_use_per_customer_usage(self):
         """ Verify voucher is created with `MULTI_USE_PER_CUSTOMER` usage type. """
         voucher_data = dict(self.data, usage=Voucher.MULTI_USE_PER_CUSTOMER)
@@ -106,6 +116,20 @@ class VoucherTests(TestCase):
         voucher.record_usage(order, user)
         voucher.offers.first().record_usage(discount={'freq': 1, 'discount': 1})
 
+    def test_record_usage(self):
+        """ Verify recording a usage adds an application and increments the order count in the database. """
+        voucher = Voucher.objects.create(**self.data)
+        user = UserFactory()
+        stale_voucher = Voucher.objects.get(pk=voucher.pk)
+
+        voucher.record_usage(OrderFactory(), user)
+        stale_voucher.record_usage(OrderFactory(), user)
+
+        assert voucher.num_orders == 1
+        assert voucher.applications.filter(user=user).count() == 2
+        voucher.refresh_from_db()
+        assert voucher.num_orders == 2
+
     def test_multi_use_per_customer_voucher(self):
         """
         Verify `MULTI_USE_PER_CUSTOMER` behaves as expected.
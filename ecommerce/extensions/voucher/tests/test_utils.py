@@ -4,6 +4,7 @@
 import uuid
 
 import ddt
+import mock
 import responses
 from django.core.exceptions import ValidationError
 from django.db import IntegrityError
@@ -293,6 +294,35 @@ class UtilTests(CouponMixin, DiscoveryMockMixin, DiscoveryTestMixin, LmsApiMockM
             voucher = create_vouchers(**self.data)
             self.assertTrue(Voucher.objects.filter(code__iexact=voucher[0].code).exists())
 
+    def test_create_vouchers_bulk_inserts(self):
+        """
+        Test that vouchers are inserted together, with unique codes, and saved before their offers are attached.
+        """
+        vouchers = create_vouchers(**self.data)
+
+        self.assertEqual(len({voucher.code for voucher in vouchers}), self.data['quantity'])
+        self.assertTrue(all(voucher.pk for voucher in vouchers))
+        vouchers_with_offers = Voucher.objects.filter(
+            offers__isnull=False,
+            pk__in=[voucher.pk for voucher in vouchers]
+        ).distinct()
+        self.assertEqual(vouchers_with_offers.count(), self.data['quantity'])
+
+    def test_create_vouchers_skips_codes_taken_in_another_case(self):
+        """
+        Test that a generated code collides with an existing voucher code that differs only in case.
+        """
+        existing_voucher = create_vouchers(**dict(self.data, quantity=1))[0]
+        Voucher.objects.filter(pk=existing_voucher.pk).update(code='taken1')
+
+        with mock.patch(
+            'ecommerce.extensions.voucher.utils._random_code_string', side_effect=['TAKEN1', 'FRESH1']
+        ):
+            vouchers = create_vouchers(**dict(self.data, quantity=1))
+
+        self.assertEqual([voucher.code for voucher in vouchers], ['FRESH1'])
+        self.assertTrue(vouchers[0].pk)
+
     @override_settings(VOUCHER_CODE_LENGTH=0)
     def test_nonpositive_voucher_code_length(self):
         """
@@ -302,6 +332,17 @@ class UtilTests(CouponMixin, DiscoveryMockMixin, DiscoveryTestMixin, LmsApiMockM
         with self.assertRaises(ValueError):
             create_vouchers(**self.data)
 
+    @override_settings(VOUCHER_CODE_LENGTH=1)
+    def test_create_vouchers_fails_when_codes_run_out(self):
+        """
+        Test that requesting more codes than the code length allows raises a ValueError
+        instead of retrying forever.
+        """
+        # Base32 codes of length one only have 32 possible values.
+        with self.assertRaises(ValueError):
+            create_vouchers(**dict(self.data, quantity=33))
+        self.assertFalse(Voucher.objects.exists())
+
     def test_create_discount_coupon(self):
         """
         Test discount voucher creation with specified code
@@ -7,10 +7,13 @@ import hashlib
 import logging
 import uuid
 from decimal import Decimal, DecimalException
+from functools import reduce
+from operator import or_
 
 import dateutil.parser
 import pytz
 from django.conf import settings
+from django.db.models import Prefetch, Q
 from django.urls import reverse
 from django.utils.translation import ugettext_lazy as _
 from edx_django_utils.cache import TieredCache
@@ -48,6 +51,11 @@ Voucher = get_model('voucher', 'Voucher')
 VoucherApplication = get_model('voucher', 'VoucherApplication')
 VoucherOffer = get_model('voucher', 'Voucher_offers')
 
+# Number of codes checked for collisions with existing vouchers per query.
+COLLISION_CHECK_BATCH_SIZE = 100
+# Number of random codes that may be drawn per requested code before bulk code generation gives up.
+MAX_CODE_GENERATION_ATTEMPTS_PER_CODE = 10
+
 
 def _add_redemption_course_ids(new_row_to_append, header_row, redemption_course_ids):
     if any(row in [_('Catalog Query'), _('Program UUID')] for row in header_row):
@@ -296,7 +304,22 @@ def generate_coupon_report(coupon_vouchers):
         rows.append(_get_info_for_coupon_report(coupon, coupon_voucher.vouchers.first()))
         rows[0][_('Client')] = client
 
-        for voucher in coupon_voucher.vouchers.all().prefetch_related('offers'):
+        # Fetch the offers, their conditions and every redemption for all of the coupon's vouchers up front,
+        # rather than querying for them once per voucher. Redemption rows only need the order number and the
+        # username, so the wide order and user rows are not loaded in full.
+        vouchers = coupon_voucher.vouchers.all().prefetch_related(
+            Prefetch('offers', queryset=ConditionalOffer.objects.select_related('condition', 'benefit')),
+            Prefetch(
+                'applications',
+                queryset=VoucherApplication.objects.select_related('user', 'order').only(
+                    'voucher', 'user', 'user__username', 'order', 'order__number',
+                ).prefetch_related(
+                    'order__lines__product__product_class',
+                    'order__lines__product__parent__product_class',
+                )
+            ),
+        )
+        for voucher in vouchers:
             row = _get_voucher_info_for_coupon_report(voucher)
 
             for item in (_('Order Number'), _('Redeemed By Username'),):
@@ -305,10 +328,7 @@ def generate_coupon_report(coupon_vouchers):
             rows.append(row)
 
             if voucher.num_orders > 0:
-                voucher_applications = VoucherApplication.objects.filter(
-                    voucher=voucher).prefetch_related('user', 'order__lines')
-
-                for application in voucher_applications:
+                for application in voucher.applications.all():
                     redemption_course_ids = _get_redemption_course_ids(application)
                     redemption_user_username = application.user.username
 
@@ -488,9 +508,9 @@ def get_or_create_enterprise_offer(
     return offer
 
 
-def _generate_code_string(length):
+def _random_code_string(length):
     """
-    Create a string of random characters of specified length
+    Create a random voucher code of specified length, without checking it against existing vouchers.
 
     Args:
         length (int): Defines the length of randomly generated string.
@@ -506,45 +526,138 @@ def _generate_code_string(length):
 
     h = hashlib.sha256()
     h.update(uuid.uuid4().bytes)
-    voucher_code = base64.b32encode(h.digest())[0:length].decode('utf-8')
+    return base64.b32encode(h.digest())[0:length].decode('utf-8')
+
+
+def _generate_code_string(length):
+    """
+    Create a string of random characters of specified length
+
+    Args:
+        length (int): Defines the length of randomly generated string.
+
+    Raises:
+        ValueError raised if length is less than one.
+
+    Returns:
+        str
+    """
+    voucher_code = _random_code_string(length)
     if Voucher.objects.filter(code__iexact=voucher_code).exists():
         return _generate_code_string(length)
 
     return voucher_code
 
 
-def create_new_voucher(code, end_datetime, name, start_datetime, voucher_type):
+def _get_existing_codes(codes):
     """
-    Creates a voucher.
+    Return the upper-cased codes, among the given ones, that are already used by a voucher, ignoring case.
+
+    Args:
+        codes (iterable[str]): Codes to check.
+
+    Returns:
+        set[str]
+    """
+    codes = list(codes)
+    existing_codes = set()
+    # Keep each OR-ed lookup small enough for every database backend.
+    for i in range(0, len(codes), COLLISION_CHECK_BATCH_SIZE):
+        code_filter = reduce(or_, (Q(code__iexact=code) for code in codes[i:i + COLLISION_CHECK_BATCH_SIZE]))
+        existing_codes.update(
+            code.upper() for code in Voucher.objects.filter(code_filter).values_list('code', flat=True)
+        )
+    return existing_codes
 
-    If randomly generated voucher code already exists, new code will be generated and reverified.
+
+def _generate_code_strings(length, quantity):
+    """
+    Create a list of unique random voucher codes of specified length that are not used by any existing voucher.
 
     Args:
-        code (str): Code associated with vouchers. If not provided, one will be generated.
+        length (int): Defines the length of each randomly generated code.
+        quantity (int): Number of codes to generate.
+
+    Raises:
+        ValueError raised if length is less than one, or if not enough unused codes of this length
+        could be generated within MAX_CODE_GENERATION_ATTEMPTS_PER_CODE attempts per code.
+
+    Returns:
+        list[str]
+    """
+    codes = []
+    attempts_left = quantity * MAX_CODE_GENERATION_ATTEMPTS_PER_CODE
+    while len(codes) < quantity:
+        candidates = set()
+        while len(candidates) < quantity - len(codes):
+            if attempts_left <= 0:
+                raise ValueError(
+                    'Could not generate {quantity} unused voucher codes of length {length}.'.format(
+                        quantity=quantity, length=length
+                    )
+                )
+            attempts_left -= 1
+            candidates.add(_random_code_string(length).upper())
+        candidates.difference_update(codes)
+        # Check the candidates for collisions in bulk, and only regenerate the ones that collided.
+        candidates.difference_update(_get_existing_codes(candidates))
+        codes.extend(candidates)
+
+    return codes
+
+
+def _build_new_voucher(code, end_datetime, name, start_datetime, voucher_type):
+    """
+    Build and validate an unsaved voucher with the given code.
+
+    Args:
+        code (str): Code associated with the voucher.
         end_datetime (datetime): Voucher end date.
         name (str): Voucher name.
-        offer (Offer): Offer associated with voucher.
         start_datetime (datetime): Voucher start date.
         voucher_type (str): Voucher usage.
 
     Returns:
         Voucher
     """
-    voucher_code = code or _generate_code_string(settings.VOUCHER_CODE_LENGTH)
     if not isinstance(start_datetime, datetime.datetime):
         start_datetime = dateutil.parser.parse(start_datetime)
 
     if not isinstance(end_datetime, datetime.datetime):
         end_datetime = dateutil.parser.parse(end_datetime)
 
-    name = name[:128 - len(voucher_code)] + voucher_code
-    voucher = Voucher.objects.create(
-        name=name,
-        code=voucher_code,
+    voucher = Voucher(
+        name=name[:128 - len(code)] + code,
+        code=code,
         usage=voucher_type,
         start_datetime=start_datetime,
         end_datetime=end_datetime,
     )
+    voucher.prepare_for_save()
+
+    return voucher
+
+
+def create_new_voucher(code, end_datetime, name, start_datetime, voucher_type):
+    """
+    Creates a voucher.
+
+    If randomly generated voucher code already exists, new code will be generated and reverified.
+
+    Args:
+        code (str): Code associated with vouchers. If not provided, one will be generated.
+        end_datetime (datetime): Voucher end date.
+        name (str): Voucher name.
+        offer (Offer): Offer associated with voucher.
+        start_datetime (datetime): Voucher start date.
+        voucher_type (str): Voucher usage.
+
+    Returns:
+        Voucher
+    """
+    voucher_code = code or _generate_code_string(settings.VOUCHER_CODE_LENGTH)
+    voucher = _build_new_voucher(voucher_code, end_datetime, name, start_datetime, voucher_type)
+    voucher.save()
 
     return voucher
 
@@ -577,17 +690,26 @@ def create_vouchers_and_attach_offers(
     Returns:
         List[Voucher]
     """
-    vouchers = []
+    codes = [code] * quantity if code else _generate_code_strings(settings.VOUCHER_CODE_LENGTH, quantity)
+    vouchers = [
+        _build_new_voucher(voucher_code, end_datetime, name, start_datetime, voucher_type)
+        for voucher_code in codes
+    ]
+    Voucher.objects.bulk_create(vouchers)
+    if vouchers and vouchers[0].pk is None:
+        # Not every database backend returns primary keys from a bulk insert, so read them back using the unique codes.
+        voucher_ids = {
+            voucher_code.upper(): voucher_id
+            for voucher_code, voucher_id in Voucher.objects.filter(
+                code__in=[voucher.code for voucher in vouchers]
+            ).values_list('code', 'id')
+        }
+        for voucher in vouchers:
+            voucher.pk = voucher_ids[voucher.code.upper()]
+
     voucher_offers = []
     enterprise_voucher_offers = []
-    for i in range(quantity):
-        voucher = create_new_voucher(
-            end_datetime=end_datetime,
-            start_datetime=start_datetime,
-            voucher_type=voucher_type,
-            code=code,
-            name=name
-        )
+    for i, voucher in enumerate(vouchers):
         voucher_offers.append(
             VoucherOffer(voucher=voucher, conditionaloffer=offers[i] if len(offers) > 1 else offers[0])
         )
@@ -598,7 +720,6 @@ def create_vouchers_and_attach_offers(
                     conditionaloffer=enterprise_offers[i] if len(enterprise_offers) > 1 else enterprise_offers[0]
                 )
             )
-        vouchers.append(voucher)
 
     VoucherOffer.objects.bulk_create(voucher_offers)
     VoucherOffer.objects.bulk_create(enterprise_voucher_offers)
@@ -174,7 +174,9 @@ PAYMENT_PROCESSOR_CONFIG = {
             'api_version': '2022-08-01; server_side_confirmation_beta=v1',
             'enable_telemetry': None,
             'log_level': None,
-            'max_network_retries': 0,
+            # Connection errors, 409s and 429s are retried by the Stripe client with exponential backoff and an
+            # automatic idempotency key. Card declines and invalid requests are never retried.
+            'max_network_retries': 2,
             'proxy': None,
             'publishable_key': None,
             'secret_key': None,
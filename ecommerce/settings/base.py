@@ -290,7 +290,10 @@ EXTRA_PAYMENT_PROCESSOR_URLS = {}
 
 VOUCHER_CACHE_TIMEOUT = 10  # Value is in seconds.
 
+COUNTRY_CACHE_TIMEOUT = 86400  # Value is in seconds.
+
 SDN_CHECK_REQUEST_TIMEOUT = 5  # Value is in seconds.
+SDN_CHECK_CACHE_TIMEOUT = 300  # Value is in seconds.
 
 # APP CONFIGURATION
 DJANGO_APPS = [
@@ -832,7 +835,9 @@ ECOMMERCE_PAYMENT_PROCESSOR_CONFIG = {
             'api_version': '2022-08-01; server_side_confirmation_beta=v1',
             'enable_telemetry': None,
             'log_level': None,
-            'max_network_retries': 0,
+            # Connection errors, 409s and 429s are retried by the Stripe client with exponential backoff and an
+            # automatic idempotency key. Card declines and invalid requests are never retried.
+            'max_network_retries': 2,
             'proxy': None,
             'publishable_key': 'SET-ME-PLEASE',
             'secret_key': 'SET-ME-PLEASE',
@@ -13,7 +13,7 @@ ALLOWED_HOSTS = ['*']
 # Disable syslog logging since we usually do not have syslog enabled in test environments.
 LOGGING['handlers']['local'] = {'class': 'logging.NullHandler'}
 
-# Disable console logging to cut down on log size. Nose will capture the logs for us.
+# Disable console logging to cut down on log size. pytest will capture the logs for us.
 LOGGING['handlers']['console'] = {'class': 'logging.NullHandler'}
 
 # END TEST SETTINGS
@@ -28,6 +28,10 @@ DATABASES = {
         'PORT': os.environ.get('DB_PORT', ''),
         'CONN_MAX_AGE': int(os.environ.get('CONN_MAX_AGE', 0)),
         'ATOMIC_REQUESTS': True,
+        'TEST': {
+            # No test relies on serialized_rollback, so skip serializing the test database after it is created.
+            'SERIALIZE': False,
+        },
     },
 }
 
@@ -55,53 +59,61 @@ EDX_API_KEY = 'replace-me'
 
 
 # PAYMENT PROCESSING
+# Settings shared by both test sites' processors. Each site gets its own copy so that a test changing one
+# site's configuration cannot leak into the other's.
+_CYBERSOURCE_TEST_CONFIG = {
+    'soap_api_url': 'https://ics2wstest.ic3.com/commerce/1.x/transactionProcessor/CyberSourceTransaction_1.166.wsdl',
+    'cancel_checkout_path': PAYMENT_PROCESSOR_CANCEL_PATH,
+    'send_level_2_3_details': True,
+}
+_APPLE_PAY_TEST_CONFIG = {
+    'apple_pay_merchant_identifier': 'merchant.com.example',
+    'apple_pay_merchant_id_domain_association': 'fake-merchant-id-domain-association',
+    'apple_pay_merchant_id_certificate_path': '',
+    'apple_pay_country_code': 'US',
+}
+_PAYPAL_TEST_CONFIG = {
+    'mode': 'sandbox',
+    'cancel_checkout_path': PAYMENT_PROCESSOR_CANCEL_PATH,
+    'error_path': PAYMENT_PROCESSOR_ERROR_PATH,
+}
+_STRIPE_TEST_CONFIG = {
+    'api_version': '2022-08-01; server_side_confirmation_beta=v1',
+    'enable_telemetry': None,
+    'log_level': 'debug',
+    'max_network_retries': 0,
+    'proxy': None,
+    'publishable_key': 'fake-publishable-key',
+    'secret_key': 'fake-secret-key',
+    'webhook_endpoint_secret': 'fake-webhook-key',
+    'error_path': PAYMENT_PROCESSOR_ERROR_PATH,
+    'cancel_checkout_path': PAYMENT_PROCESSOR_CANCEL_PATH,
+    'receipt_url': PAYMENT_PROCESSOR_RECEIPT_PATH,
+}
+
 PAYMENT_PROCESSOR_CONFIG = {
     'edx': {
         'cybersource': {
-            'soap_api_url': 'https://ics2wstest.ic3.com/commerce/1.x/transactionProcessor/CyberSourceTransaction_1.166.wsdl',
+            **_CYBERSOURCE_TEST_CONFIG,
+            **_APPLE_PAY_TEST_CONFIG,
             'merchant_id': 'fake-merchant-id',
             'transaction_key': 'fake-transaction-key',
-            'cancel_checkout_path': PAYMENT_PROCESSOR_CANCEL_PATH,
-            'send_level_2_3_details': True,
-            'apple_pay_merchant_identifier': 'merchant.com.example',
-            'apple_pay_merchant_id_domain_association': 'fake-merchant-id-domain-association',
-            'apple_pay_merchant_id_certificate_path': '',
-            'apple_pay_country_code': 'US',
         },
         'cybersource-rest': {
-            'soap_api_url': 'https://ics2wstest.ic3.com/commerce/1.x/transactionProcessor/CyberSourceTransaction_1.166.wsdl',
+            **_CYBERSOURCE_TEST_CONFIG,
+            **_APPLE_PAY_TEST_CONFIG,
             'merchant_id': 'fake-merchant-id',
             'transaction_key': 'fake-transaction-key',
-            'cancel_checkout_path': PAYMENT_PROCESSOR_CANCEL_PATH,
-            'send_level_2_3_details': True,
-            'apple_pay_merchant_identifier': 'merchant.com.example',
-            'apple_pay_merchant_id_domain_association': 'fake-merchant-id-domain-association',
-            'apple_pay_merchant_id_certificate_path': '',
-            'apple_pay_country_code': 'US',
             'flex_shared_secret_key_id': 'd2df1f49-dffa-4814-8da2-2751a62b79a6',
             'flex_shared_secret_key': 'c9QEORcKDT7u27zLtuy2S0T/HfKo8gl+JnCy6OHtm9Q=',
         },
         'paypal': {
-            'mode': 'sandbox',
+            **_PAYPAL_TEST_CONFIG,
             'client_id': 'fake-client-id',
             'client_secret': 'fake-client-secret',
-            'cancel_checkout_path': PAYMENT_PROCESSOR_CANCEL_PATH,
-            'error_path': PAYMENT_PROCESSOR_ERROR_PATH,
         },
         'invoice': {},
-        'stripe': {
-            'api_version': '2022-08-01; server_side_confirmation_beta=v1',
-            'enable_telemetry': None,
-            'log_level': 'debug',
-            'max_network_retries': 0,
-            'proxy': None,
-            'publishable_key': 'fake-publishable-key',
-            'secret_key': 'fake-secret-key',
-            'webhook_endpoint_secret': 'fake-webhook-key',
-            'error_path': PAYMENT_PROCESSOR_ERROR_PATH,
-            'cancel_checkout_path': PAYMENT_PROCESSOR_CANCEL_PATH,
-            'receipt_url': PAYMENT_PROCESSOR_RECEIPT_PATH,
-        },
+        'stripe': dict(_STRIPE_TEST_CONFIG),
         'android-iap': {
             'google_bundle_id': '<put-value-here>',
             'google_service_account_key_file': '<put-value-here>'
@@ -112,43 +124,25 @@ PAYMENT_PROCESSOR_CONFIG = {
     },
     'other': {
         'cybersource': {
-            'soap_api_url': 'https://ics2wstest.ic3.com/commerce/1.x/transactionProcessor/CyberSourceTransaction_1.166.wsdl',
+            **_CYBERSOURCE_TEST_CONFIG,
             'merchant_id': 'other-fake-merchant-id',
             'transaction_key': 'other-fake-transaction-key',
             'receipt_path': PAYMENT_PROCESSOR_RECEIPT_PATH,
-            'cancel_checkout_path': PAYMENT_PROCESSOR_CANCEL_PATH,
-            'send_level_2_3_details': True,
         },
         'cybersource-rest': {
-            'soap_api_url': 'https://ics2wstest.ic3.com/commerce/1.x/transactionProcessor/CyberSourceTransaction_1.166.wsdl',
+            **_CYBERSOURCE_TEST_CONFIG,
             'merchant_id': 'other-fake-merchant-id',
             'transaction_key': 'other-fake-transaction-key',
             'receipt_path': PAYMENT_PROCESSOR_RECEIPT_PATH,
-            'cancel_checkout_path': PAYMENT_PROCESSOR_CANCEL_PATH,
-            'send_level_2_3_details': True,
         },
         'paypal': {
-            'mode': 'sandbox',
+            **_PAYPAL_TEST_CONFIG,
             'client_id': 'other-fake-client-id',
             'client_secret': 'other-fake-client-secret',
             'receipt_path': PAYMENT_PROCESSOR_RECEIPT_PATH,
-            'cancel_checkout_path': PAYMENT_PROCESSOR_CANCEL_PATH,
-            'error_path': PAYMENT_PROCESSOR_ERROR_PATH,
         },
         'invoice': {},
-        'stripe': {
-            'api_version': '2022-08-01; server_side_confirmation_beta=v1',
-            'enable_telemetry': None,
-            'log_level': 'debug',
-            'max_network_retries': 0,
-            'proxy': None,
-            'publishable_key': 'fake-publishable-key',
-            'secret_key': 'fake-secret-key',
-            'webhook_endpoint_secret': 'fake-webhook-key',
-            'error_path': PAYMENT_PROCESSOR_ERROR_PATH,
-            'cancel_checkout_path': PAYMENT_PROCESSOR_CANCEL_PATH,
-            'receipt_url': PAYMENT_PROCESSOR_RECEIPT_PATH,
-        },
+        'stripe': dict(_STRIPE_TEST_CONFIG),
         'android-iap': {
             'google_bundle_id': 'org.edx.mobile',
             'google_service_account_key_file': '<put-value-here>'
@@ -395,6 +395,18 @@ class TestServerUrlMixin:
         return 'http://{domain}{path}'.format(domain=site.domain, path=path)
 
 
+class LoginRequiredViewTestMixin:
+    """ Verifies that anonymous POSTs to ``path`` are redirected to the login page. """
+    path = None
+
+    def test_login_required(self):
+        """ Users are required to login before posting to the view. """
+        self.client.logout()
+        response = self.client.post(self.path)
+        expected_url = '{base}?next={path}'.format(base=reverse(settings.LOGIN_URL), path=self.path)
+        self.assertRedirects(response, expected_url, fetch_redirect_response=False)
+
+
 class ApiMockMixin:
     """ Common Mocks for the API responses. """
 
@@ -8,9 +8,12 @@ import os
 
 import waffle
 from django.conf import ImproperlyConfigured, settings
+from edx_django_utils.cache import DEFAULT_REQUEST_CACHE
 from path import Path
 from threadlocals.threadlocals import get_current_request
 
+from ecommerce.core.utils import get_cache_key
+
 logger = logging.getLogger(__name__)
 
 
@@ -67,8 +70,20 @@ def get_theme_base_dir(theme_dir_name, suppress_error=False):
     Returns:
         (str): Base directory that contains the given theme
     """
+    # The current theme is resolved for every template and static file lookup, so remember where it was found
+    # for the rest of the request instead of listing the themes dirs each time.
+    cache_key = get_cache_key(
+        resource='theme_base_dir',
+        theme_dir_name=theme_dir_name,
+        themes_dirs=settings.COMPREHENSIVE_THEME_DIRS,
+    )
+    cached_response = DEFAULT_REQUEST_CACHE.get_cached_response(cache_key)
+    if cached_response.is_found:
+        return cached_response.value
+
     for themes_dir in get_theme_base_dirs():
         if theme_dir_name in (_dir for _dir in os.listdir(themes_dir) if is_theme_dir(themes_dir / _dir)):
+            DEFAULT_REQUEST_CACHE.set(cache_key, themes_dir)
             return themes_dir
 
     if suppress_error:
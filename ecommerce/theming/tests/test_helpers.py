@@ -3,6 +3,8 @@ Tests of comprehensive theming.
 """
 
 
+import os
+
 from django.conf import ImproperlyConfigured, settings
 from django.test import override_settings
 from mock import patch
@@ -183,6 +185,19 @@ class TestHelpers(TestCase):
         self.assertEqual(get_theme_base_dir("test-theme-2"), theme_dirs[0])
         self.assertEqual(get_theme_base_dir("test-theme-3"), theme_dirs[1])
 
+    def test_get_theme_base_dir_cached(self):
+        """
+        Tests get_theme_base_dir only searches the themes dirs once for a theme.
+        """
+        theme_dirs = settings.COMPREHENSIVE_THEME_DIRS
+
+        with patch('ecommerce.theming.helpers.os.listdir', wraps=os.listdir) as mock_listdir:
+            self.assertEqual(get_theme_base_dir("test-theme"), theme_dirs[0])
+            listdir_calls = mock_listdir.call_count
+            self.assertEqual(get_theme_base_dir("test-theme"), theme_dirs[0])
+
+        self.assertEqual(mock_listdir.call_count, listdir_calls)
+
     def test_get_theme_base_dir_error(self):
         """
         Tests get_theme_base_dir raises value error if theme is not found in themes dir.